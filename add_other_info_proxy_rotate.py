@@ -33,6 +33,11 @@ def load_proxies(file_path):
 
 PROXY_LIST = load_proxies('proxy-list.txt')
 
+# Columns read from the OUTPUT_1 file; the large PHOTO URLs column is left out
+INPUT_COLUMNS = ['HOUSE URL', 'PRICE', 'FULL ADDRESS', 'STREET', 'CITY', 'STATE', 'ZIP CODE',
+                 'NUMBER OF BEDROOMS', 'NUMBER OF BATHROOMS', 'HOUSE SIZE', 'LOT SIZE', 'HOUSE TYPE']
+CHUNK_SIZE = 10000
+
 
 def get_random_proxy():
     return random.choice(PROXY_LIST)
@@ -171,57 +176,117 @@ def ensure_output_directory(directory):
 
 
 def load_progress(output_file):
+    # Return the scraped URLs and the output header; only the URL column is read in full
     if os.path.exists(output_file):
-        return pd.read_csv(output_file)
-    return pd.DataFrame()
-
-
-def save_progress(df, output_file):
-    df.to_csv(output_file, index=False)
+        columns = list(pd.read_csv(output_file, nrows=0).columns)
+        scraped_urls = set(pd.read_csv(output_file, usecols=['HOUSE URL'])['HOUSE URL'])
+        return scraped_urls, columns
+    return set(), None
+
+
+def save_progress(row, output_file, columns=None):
+    # Append the row under the existing header, e.g. a file written before PHOTO URLs was dropped,
+    # or create the file when there is no header yet. Returns the header of the output file.
+    new_row = pd.DataFrame([row])
+    if columns is None:
+        new_row.to_csv(output_file, index=False)
+        columns = list(new_row.columns)
+    else:
+        new_row.reindex(columns=columns).to_csv(
+            output_file, mode='a', header=False, index=False)
     logging.info(f"Progress saved to {output_file}")
+    return columns
+
+
+def check_shard_range(start_row, end_row):
+    if start_row < 0:
+        raise ValueError(f"Shard start must not be negative, got {start_row}")
+    if end_row is not None and end_row <= start_row:
+        raise ValueError(
+            f"Shard end ({end_row}) must be greater than shard start ({start_row})")
+
+
+def read_input_chunks(input_file, start_row=0, end_row=None, chunksize=CHUNK_SIZE, memory_map=True):
+    # Stream rows [start_row, end_row) of the input in chunks, reading only INPUT_COLUMNS.
+    # Rows before start_row are still read through by the parser (quoted fields can span lines),
+    # but they are discarded without being kept in memory.
+    check_shard_range(start_row, end_row)
+
+    nrows = None if end_row is None else end_row - start_row
+    # Values are read as plain strings so every row is copied to the output exactly as written,
+    # instead of pandas guessing a type per chunk (e.g. 3 in one chunk and 3.0 in another).
+    reader = pd.read_csv(input_file,
+                         usecols=lambda column: column in INPUT_COLUMNS,
+                         skiprows=lambda i: 0 < i <= start_row,
+                         nrows=nrows,
+                         dtype=str,
+                         keep_default_na=False,
+                         chunksize=chunksize,
+                         memory_map=memory_map)
+    rows_read = 0
+    with reader:
+        for chunk in reader:
+            if chunk.empty:
+                continue
+            rows_read += len(chunk)
+            yield chunk
+
+    if rows_read == 0 and start_row > 0:
+        raise ValueError(
+            f"Shard start ({start_row}) is past the end of {input_file}")
 
 
 def main():
     input_file = './OUTPUT_1/house_details.csv'
 
+    # Shard the input by row range so several processes can split one file, e.g.
+    # SHARD_START=0 SHARD_END=250000 python add_other_info_proxy_rotate.py
+    # Set MEMORY_MAP=0 to read the input without memory-mapping it.
+    shard_start = int(os.getenv('SHARD_START') or 0)
+    shard_end_env = os.getenv('SHARD_END')
+    shard_end = int(shard_end_env) if shard_end_env else None
+    memory_map = os.getenv('MEMORY_MAP', '1').lower() not in ('0', 'false', 'no')
+    check_shard_range(shard_start, shard_end)
+
     output_directory = 'OUTPUT_2'
-    file_name = 'house_details_scraped.csv'
+    if shard_start == 0 and shard_end is None:
+        file_name = 'house_details_scraped.csv'
+    else:
+        end_label = 'end' if shard_end is None else shard_end
+        file_name = f'house_details_scraped-{shard_start}-{end_label}.csv'
     output_file = os.path.join(output_directory, file_name)
     ensure_output_directory(output_directory)
 
-    df = pd.read_csv(input_file)
+    # The total is only known up front when the shard has an explicit end
+    shard_total = None if shard_end is None else shard_end - shard_start
+    logging.info(
+        f"Processing rows {shard_start} to {'end' if shard_end is None else shard_end} of {input_file}")
 
     # Load existing progress
-    result_df = load_progress(output_file)
-
-    # Determine which URLs have already been scraped
-    scraped_urls = set(result_df['HOUSE URL']
-                       ) if 'HOUSE URL' in result_df.columns else set()
+    scraped_urls, output_columns = load_progress(output_file)
 
     # Scrape data for each house URL
-    for _, row in tqdm(df.iterrows(), total=df.shape[0], desc="Scraping Progress"):
-        house_url = row['HOUSE URL']
-
-        # Skip if already scraped
-        if house_url in scraped_urls:
-            continue
-
-        logging.info(f"Scraping data for {house_url}")
-        data = scrape_house_data(house_url)
-
-        if data:
-            # Combine the original row data with the scraped data
-            combined_data = {**row.to_dict(), **data}
-            new_row = pd.DataFrame([combined_data])
-
-            # Append the new row to the result DataFrame
-            result_df = pd.concat([result_df, new_row], ignore_index=True)
-
-            # Save progress after each successful scrape
-            save_progress(result_df, output_file)
-
-        # Add a random delay between requests (1 to 5 seconds)
-        time.sleep(random.uniform(1, 5))
+    with tqdm(total=shard_total, desc="Scraping Progress") as pbar:
+        for chunk in read_input_chunks(input_file, shard_start, shard_end, memory_map=memory_map):
+            for row in chunk.to_dict('records'):
+                pbar.update(1)
+                house_url = row['HOUSE URL']
+
+                # Skip if already scraped
+                if house_url in scraped_urls:
+                    continue
+
+                logging.info(f"Scraping data for {house_url}")
+                data = scrape_house_data(house_url)
+
+                if data:
+                    # Combine the original row data with the scraped data and save progress
+                    output_columns = save_progress(
+                        {**row, **data}, output_file, output_columns)
+                    scraped_urls.add(house_url)
+
+                # Add a random delay between requests (1 to 5 seconds)
+                time.sleep(random.uniform(1, 5))
 
     logging.info(f"Scraping completed. Final results saved to {output_file}")
     print(